@@ -1,34 +1,47 @@
 import os
-import re
 import json
+import asyncio
 import time
 import threading
 import subprocess
-from typing import Optional, Dict, List
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple
 
-from flask import Flask, jsonify# type: ignore
+import aiohttp# type: ignore
+import orjson# type: ignore
+from fastapi import FastAPI, Response# type: ignore
 from pathlib import Path
 from selenium import webdriver # type: ignore
 from selenium.webdriver.common.by import By# type: ignore
 from selenium.webdriver.chrome.service import Service as ChromeService# type: ignore
 from selenium.webdriver.support.ui import WebDriverWait# type: ignore
-from selenium.webdriver.support import expected_conditions as EC# type: ignore
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException# type: ignore
+from selenium.common.exceptions import TimeoutException, WebDriverException# type: ignore
 
+from parsing import parse_measuring_points_html
+from http_client import LOGIN_URL, MEASURING_POINTS_URL, create_session, scrape_once_async
 
 
 
 
 
-LOGIN_URL = "https://www.saveris.net/users/login"
-MEASURING_POINTS_URL = "https://www.saveris.net/MeasuringPts"
 
 # Provided by Dockerfile
 CHROME_BIN = os.getenv("CHROME_BIN", "/usr/bin/chromium-browser")
 CHROMEDRIVER_BIN = os.getenv("CHROMEDRIVER_BIN", "/usr/bin/chromedriver")
 
+# Set SAVERIS_DEBUG=1 for verbose chromedriver logging
+DEBUG = bool(os.getenv("SAVERIS_DEBUG"))
+
 OPTIONS_PATH = Path("/data/options.json")
 
+# Reused by every Chromium the pool starts; only one runs at a time
+PROFILE_DIR = Path("/tmp/chrome-profile-saveris")
+
+CHROMEDRIVER_LOG = Path("/tmp/chromedriver.log")
+# chromedriver rewrites its log on start, so a recycle also rotates it
+CHROMEDRIVER_LOG_MAX_BYTES = 10 * 1024 * 1024
+
 def log_versions():
     try:
         print("Chromium:", subprocess.check_output([CHROME_BIN, "--version"], text=True).strip())
@@ -39,74 +52,93 @@ def log_versions():
     except Exception as e:
         print("ChromeDriver version check failed:", e)
 
-log_versions()
 
-def load_options():
+@dataclass(frozen=True, slots=True)
+class Options:
+    email: str = ""
+    password: str = ""
+    scan_interval: int = 300
+    # "http" talks to saveris.net directly; "browser" drives headless Chromium
+    scrape_method: str = "http"
+    # What /diag reports about the file this was parsed from
+    file_exists: bool = False
+    keys: Tuple[str, ...] = ()
+    mtime_ns: Optional[int] = None
+
+
+def load_options() -> Options:
     """
-    Home Assistant add-on options live in /data/options.json
+    Home Assistant add-on options live in /data/options.json and only change
+    on add-on restart, so they are parsed once at startup.
     """
-    if OPTIONS_PATH.exists():
-        try:
-            data = json.loads(OPTIONS_PATH.read_text(encoding="utf-8"))
-            return data if isinstance(data, dict) else {}
-        except Exception:
-            return {}
-    return {}
-
-_opts = load_options()
-EMAIL = str(_opts.get("email", "") or "").strip()
-PASSWORD = str(_opts.get("password", "") or "").strip()
-SCAN_INTERVAL = int(_opts.get("scan_interval_seconds", 300) or 300)
+    try:
+        mtime_ns = OPTIONS_PATH.stat().st_mtime_ns
+    except OSError:
+        return Options()
+    try:
+        data = json.loads(OPTIONS_PATH.read_text(encoding="utf-8"))
+    except Exception:
+        return Options(file_exists=True, mtime_ns=mtime_ns)
+
+    if isinstance(data, dict) and isinstance(data.get("options"), dict):
+        data = data["options"]
+    if not isinstance(data, dict):
+        return Options(file_exists=True, mtime_ns=mtime_ns)
+
+    return Options(
+        email=str(data.get("email", "") or "").strip(),
+        password=str(data.get("password", "") or "").strip(),
+        scan_interval=int(data.get("scan_interval_seconds", 300) or 300),
+        scrape_method=str(data.get("scrape_method", "http") or "http").strip().lower(),
+        file_exists=True,
+        keys=tuple(sorted(data.keys())),
+        mtime_ns=mtime_ns,
+    )
 
+_OPTIONS = load_options()
+EMAIL = _OPTIONS.email
+PASSWORD = _OPTIONS.password
+SCAN_INTERVAL = _OPTIONS.scan_interval
+SCRAPE_METHOD = _OPTIONS.scrape_method
 
-app = Flask(__name__)
 
-_latest = {
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global SESSION
+    SESSION = create_session()
+    task = asyncio.create_task(background_loop())
+    try:
+        yield
+    finally:
+        # uvicorn turns SIGTERM into this shutdown; wake the loop and give
+        # an in-flight scrape a few seconds before cancelling it
+        _shutdown.set()
+        # Cancelling the task cannot stop a browser scrape running in its
+        # worker thread; quitting Chromium makes its WebDriver calls fail now
+        await asyncio.to_thread(POOL.discard)
+        with suppress(asyncio.TimeoutError, asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout=5)
+        # In case that scrape reached POOL.get() only after the discard
+        await asyncio.to_thread(POOL.discard)
+        await SESSION.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Latest scrape result, serialized once per scan and served as-is by /data.
+# Only ever rebound (bytes are immutable), so /data needs no lock.
+_latest_json = orjson.dumps({
     "status": "init",
     "count": 0,
     "measuring_points": []
-}
-_latest_lock = threading.Lock()
+})
 
+_HEALTH_JSON = orjson.dumps({"status": "ok"})
 
-# ----------------- helpers -----------------
+_shutdown = asyncio.Event()
 
-def _extract_float(s: str) -> Optional[float]:
-    if not s:
-        return None
-    m = re.match(r"\s*([+-]?\d+(?:\.\d+)?)", s.strip())
-    if not m:
-        return None
-    try:
-        return float(m.group(1))
-    except ValueError:
-        return None
-
-
-def parse_measurements_cell(cell_text: str) -> Dict[str, Optional[float]]:
-    lines = [ln.strip() for ln in (cell_text or "").splitlines() if ln.strip()]
-    out = {
-        "temperature_c": None,
-        "humidity_pct": None,
-        "dew_point_c": None,
-        "absolute_humidity_gm3": None,
-    }
-
-    for ln in lines:
-        l = ln.lower()
-        v = _extract_float(ln)
-        if v is None:
-            continue
-        if "°c td" in l:
-            out["dew_point_c"] = v
-        elif "%rh" in l:
-            out["humidity_pct"] = v
-        elif "g/m³" in l or "g/m3" in l:
-            out["absolute_humidity_gm3"] = v
-        elif "°c" in l:
-            out["temperature_c"] = v
-
-    return out
+# Shared by every HTTP scrape; opened and closed by the app lifespan
+SESSION: Optional[aiohttp.ClientSession] = None
 
 
 # ----------------- selenium -----------------
@@ -149,16 +181,24 @@ def open_browser(headless: bool = True) -> webdriver.Chrome:
    
 
 
-    # Avoid profile lock / corruption between runs
-    profile_dir = f"/tmp/chrome-profile-{int(time.time()*1000)}"
-    opts.add_argument(f"--user-data-dir={profile_dir}")
+    # A warm, reused profile; the pool makes sure it is never shared
+    opts.add_argument(f"--user-data-dir={PROFILE_DIR}")
 
     opts.add_argument("--window-size=1400,1000")
 
-    # ChromeDriver verbose logging already helped — keep it
+    # Only the table markup is needed: skip images, CSS and fonts, and let
+    # driver.get() return at DOMContentLoaded instead of the full load event
+    opts.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    opts.page_load_strategy = "eager"
+
+    # Verbose logging writes on every WebDriver command; only when debugging
     service = ChromeService(
         executable_path=CHROMEDRIVER_BIN,
-        service_args=["--verbose", "--log-path=/tmp/chromedriver.log"]
+        service_args=[f"--log-path={CHROMEDRIVER_LOG}"] + (["--verbose"] if DEBUG else [])
     )
 
     # Let Selenium manage service lifecycle; DON'T call service.start() manually
@@ -168,12 +208,100 @@ def open_browser(headless: bool = True) -> webdriver.Chrome:
 
 
 
-def find_first(driver: webdriver.Chrome, selectors):
-    for by, sel in selectors:
+# Recycle the shared Chromium after this many seconds
+DRIVER_MAX_AGE = 3600
+
+
+class _DriverPool:
+    """
+    Keeps one Chromium alive across scans instead of launching a fresh one
+    every SCAN_INTERVAL. It is replaced when it gets too old, when its
+    chromedriver process has died, or after a failed scan.
+    """
+
+    def __init__(self, max_age: int = DRIVER_MAX_AGE):
+        self.max_age = max_age
+        self.driver: Optional[webdriver.Chrome] = None
+        self.created_at = 0.0
+        self.versions_logged = False
+        self.lock = threading.Lock()
+
+    def _alive(self) -> bool:
+        if self.driver is None:
+            return False
+        if time.time() - self.created_at >= self.max_age:
+            return False
+        try:
+            if CHROMEDRIVER_LOG.stat().st_size > CHROMEDRIVER_LOG_MAX_BYTES:
+                return False
+        except OSError:
+            pass
+        process = getattr(self.driver.service, "process", None)
+        return process is not None and process.poll() is None
+
+    def _close(self) -> None:
         try:
-            return driver.find_element(by, sel)
-        except NoSuchElementException:
-            continue
+            if self.driver:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+    def _recycle(self) -> None:
+        self._close()
+        # Only needed with the browser scraper, and only once
+        if not self.versions_logged:
+            log_versions()
+            self.versions_logged = True
+        # A Chromium that died without quit() leaves its profile locks behind
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+            try:
+                (PROFILE_DIR / name).unlink()
+            except FileNotFoundError:
+                pass
+        self.driver = open_browser(headless=True)
+        self.created_at = time.time()
+
+    def get(self) -> webdriver.Chrome:
+        with self.lock:
+            if not self._alive():
+                self._recycle()
+            return self.driver
+
+    def discard(self) -> None:
+        """Drop the current browser; the next get() starts a new one."""
+        with self.lock:
+            self._close()
+
+
+POOL = _DriverPool()
+
+
+# Tried in priority order, like the HTTP scraper's _EMAIL_XPATHS: a CSS union
+# would return the first match in document order (e.g. a header search box).
+# On a normal login form the first selector hits, so this is still one query.
+_EMAIL_SELECTORS = (
+    "input[type='email']",
+    "input[name='email']",
+    "input[name='username']",
+    "input[type='text']",
+)
+_PASSWORD_SELECTOR = "input[type='password']"
+_SUBMIT_SELECTOR = "button[type='submit'], input[type='submit']"
+_SUBMIT_XPATH = "//button[contains(., 'Login') or contains(., 'Log in') or contains(., 'Sign in')]"
+
+
+def find_first(driver: webdriver.Chrome, selector: str, by: str = By.CSS_SELECTOR):
+    found = driver.find_elements(by, selector)
+    return found[0] if found else None
+
+
+def find_email_input(driver: webdriver.Chrome):
+    for selector in _EMAIL_SELECTORS:
+        found = find_first(driver, selector)
+        if found:
+            return found
     return None
 
 
@@ -181,23 +309,9 @@ def login(driver: webdriver.Chrome, email: str, password: str, timeout: int = 30
     driver.get(LOGIN_URL)
     wait = WebDriverWait(driver, timeout)
 
-    wait.until(lambda d: find_first(d, [
-        (By.CSS_SELECTOR, "input[type='email']"),
-        (By.CSS_SELECTOR, "input[name='email']"),
-        (By.CSS_SELECTOR, "input[name='username']"),
-        (By.CSS_SELECTOR, "input[type='text']"),
-    ]) is not None)
-
-    email_input = find_first(driver, [
-        (By.CSS_SELECTOR, "input[type='email']"),
-        (By.CSS_SELECTOR, "input[name='email']"),
-        (By.CSS_SELECTOR, "input[name='username']"),
-        (By.CSS_SELECTOR, "input[type='text']"),
-    ])
-    pwd_input = find_first(driver, [
-        (By.CSS_SELECTOR, "input[type='password']"),
-        (By.XPATH, "//input[@type='password']"),
-    ])
+    # until() hands back the element it found, so no second lookup
+    email_input = wait.until(find_email_input)
+    pwd_input = find_first(driver, _PASSWORD_SELECTOR)
 
     if not email_input or not pwd_input:
         raise RuntimeError("Could not locate email/password inputs")
@@ -207,11 +321,7 @@ def login(driver: webdriver.Chrome, email: str, password: str, timeout: int = 30
     pwd_input.clear()
     pwd_input.send_keys(password)
 
-    submit = find_first(driver, [
-        (By.CSS_SELECTOR, "button[type='submit']"),
-        (By.CSS_SELECTOR, "input[type='submit']"),
-        (By.XPATH, "//button[contains(., 'Login') or contains(., 'Log in') or contains(., 'Sign in')]"),
-    ])
+    submit = find_first(driver, _SUBMIT_SELECTOR) or find_first(driver, _SUBMIT_XPATH, By.XPATH)
 
     if submit:
         submit.click()
@@ -219,55 +329,14 @@ def login(driver: webdriver.Chrome, email: str, password: str, timeout: int = 30
         pwd_input.send_keys("\n")
 
     try:
-        wait.until(lambda d: d.current_url != LOGIN_URL)
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(lambda d: d.current_url != LOGIN_URL)
     except TimeoutException:
         pass
 
 
-def parse_measuring_points(driver: webdriver.Chrome) -> List[Dict]:
-    results: List[Dict] = []
-
-    tbody = driver.find_element(By.CSS_SELECTOR, "#measuring-points tbody")
-    trs = tbody.find_elements(By.XPATH, "./tr")
-
-    for tr in trs:
-        if "row-details" in (tr.get_attribute("class") or ""):
-            continue
-
-        tds = tr.find_elements(By.TAG_NAME, "td")
-        if len(tds) < 7:
-            continue
-
-        measuring_point = (tds[2].text or "").strip()
-
-        try:
-            group = (tds[3].find_element(By.TAG_NAME, "a").text or "").strip()
-        except NoSuchElementException:
-            group = (tds[3].text or "").strip() or None
-
-        cell_text = (tds[4].get_attribute("innerText") or tds[4].text or "").strip()
-        parsed = parse_measurements_cell(cell_text)
-
-        last_meas = (tds[5].text or "").strip() or None
-        internal_id = (tds[6].text or "").strip() or None
-
-        results.append({
-            "measuring_point": measuring_point,
-            "group": group,
-            "temperature_c": parsed["temperature_c"],
-            "humidity_pct": parsed["humidity_pct"],
-            "dew_point_c": parsed["dew_point_c"],
-            "absolute_humidity_gm3": parsed["absolute_humidity_gm3"],
-            "last_measurement": last_meas,
-            "internal_id": internal_id,
-        })
-
-    return results
-
-
 # ----------------- scrape loop -----------------
 
-def scrape_once() -> Dict:
+async def scrape_once() -> Dict:
     if not EMAIL or not PASSWORD:
         return {
             "status": "error",
@@ -276,18 +345,64 @@ def scrape_once() -> Dict:
             "measuring_points": [],
         }
 
-    driver = None
+    if SCRAPE_METHOD == "browser":
+        # Selenium blocks; keep it off the event loop
+        return await asyncio.to_thread(scrape_once_browser)
+    return await scrape_once_async(SESSION, EMAIL, PASSWORD)
+
+
+_ROWS_SELECTOR = "#measuring-points tbody > tr:not(.row-details)"
+_TBODY_READY_JS = (
+    "return document.readyState !== 'loading'"
+    " && document.querySelector('#measuring-points tbody') !== null;"
+)
+_TABLE_HTML_JS = (
+    "const t = document.querySelector('#measuring-points');"
+    " return t ? t.outerHTML : null;"
+)
+
+
+def _rows_stable():
+    """
+    Wait condition: true once the table has rows and the row count did not
+    change since the previous poll.
+    """
+    last = {"n": -1}
+
+    def check(d) -> bool:
+        n = len(d.find_elements(By.CSS_SELECTOR, _ROWS_SELECTOR))
+        stable = n > 0 and n == last["n"]
+        last["n"] = n
+        return stable
+
+    return check
+
+
+def scrape_once_browser() -> Dict:
     try:
-        driver = open_browser(headless=True)
-        login(driver, EMAIL, PASSWORD)
+        driver = POOL.get()
 
+        # The pooled browser usually still has a session; only log in when bounced
         driver.get(MEASURING_POINTS_URL)
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "#measuring-points tbody"))
+        if driver.current_url.startswith(LOGIN_URL):
+            login(driver, EMAIL, PASSWORD)
+            driver.get(MEASURING_POINTS_URL)
+
+        # driver.get() has already waited for DOMContentLoaded, so this
+        # normally succeeds on the first check
+        WebDriverWait(driver, 30, poll_frequency=0.1).until(
+            lambda d: d.execute_script(_TBODY_READY_JS)
         )
-        time.sleep(1.0)
-
-        rows = parse_measuring_points(driver)
+        try:
+            WebDriverWait(driver, 10, poll_frequency=0.2).until(_rows_stable())
+        except TimeoutException:
+            pass  # empty or still changing table; parse what is there
+
+        # One script call returns just the table; parsing happens locally
+        table_html = driver.execute_script(_TABLE_HTML_JS)
+        if not table_html:
+            raise RuntimeError("Measuring points table not found")
+        rows = parse_measuring_points_html(table_html)
         return {
             "status": "ok",
             "count": len(rows),
@@ -295,6 +410,7 @@ def scrape_once() -> Dict:
         }
 
     except (RuntimeError, WebDriverException, TimeoutException) as e:
+        POOL.discard()
         return {
             "status": "error",
             "error": str(e),
@@ -302,90 +418,72 @@ def scrape_once() -> Dict:
             "measuring_points": [],
         }
 
-    finally:
-        try:
-            if driver:
-                driver.quit()
-        except Exception:
-            pass
-
 
-def background_loop():
-    global _latest
+async def background_loop():
+    global _latest_json
+    interval = max(30, SCAN_INTERVAL)
+    # Scans start on a fixed cadence, so scrape time does not add drift
+    next_deadline = time.monotonic()
     while True:
         try:
-            data = scrape_once()
+            data = await scrape_once()
         except Exception as e:
             data = {"status": "error", "error": f"background exception: {e}", "count": 0, "measuring_points": []}
 
-        with _latest_lock:
-            _latest = data
+        _latest_json = orjson.dumps(data)
 
         print(f"[saveris] status={data.get('status')} count={data.get('count')} error={data.get('error','') if data.get('status')=='error' else ''}")
 
-        time.sleep(max(30, SCAN_INTERVAL))
+        now = time.monotonic()
+        while next_deadline <= now:
+            next_deadline += interval  # skip slots missed by a slow scrape
+        try:
+            await asyncio.wait_for(_shutdown.wait(), timeout=max(1, next_deadline - now))
+            break
+        except asyncio.TimeoutError:
+            pass
 
 
 
 # ----------------- http api -----------------
 
 @app.get("/health")
-def health():
-    return jsonify({"status": "ok"})
+async def health():
+    return Response(_HEALTH_JSON, media_type="application/json")
 
 
 @app.get("/data")
-def data():
-    with _latest_lock:
-        return jsonify(_latest)
+async def data():
+    return Response(_latest_json, media_type="application/json")
     
 @app.get("/diag")
-def diag():
-    from pathlib import Path
-    import json
-
-    p = Path("/data/options.json")
-    exists = p.exists()
-    raw = ""
-    keys = []
-    email_present = False
-    password_present = False
-
-    if exists:
-        try:
-            raw = p.read_text(encoding="utf-8")
-            data = json.loads(raw)
-            if isinstance(data, dict) and isinstance(data.get("options"), dict):
-                data = data["options"]
-            if isinstance(data, dict):
-                keys = sorted(list(data.keys()))
-                email_present = bool(str(data.get("email", "")).strip())
-                password_present = bool(str(data.get("password", "")).strip())
-        except Exception:
-            pass
-
-    return jsonify({
-        "options_file_exists": exists,
-        "options_keys": keys,
-        "email_present": email_present,
-        "password_present": password_present
-    })
+async def diag():
+    try:
+        mtime_ns: Optional[int] = OPTIONS_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+
+    return {
+        "options_file_exists": _OPTIONS.file_exists,
+        "options_keys": list(_OPTIONS.keys),
+        "email_present": bool(_OPTIONS.email),
+        "password_present": bool(_OPTIONS.password),
+        # True means the file was edited after startup; restart to apply
+        "options_changed": mtime_ns != _OPTIONS.mtime_ns,
+    }
 
 @app.get("/chromedriver_log")
-def chromedriver_log():
-    p = Path("/tmp/chromedriver.log")
+async def chromedriver_log():
+    p = CHROMEDRIVER_LOG
     if not p.exists():
-        return jsonify({"exists": False})
-    # return last 200 lines max
-    lines = p.read_text(encoding="utf-8", errors="ignore").splitlines()[-200:]
-    return jsonify({"exists": True, "tail": lines})
-
-
-
-# ----------------- main -----------------
-
-if __name__ == "__main__":
-    t = threading.Thread(target=background_loop, daemon=True)
-    t.start()
-    app.run(host="0.0.0.0", port=8088)
-
+        return {"exists": False}
+    # return last 200 lines max, reading only the end of the file
+    with p.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        lines = f.read().decode("utf-8", "ignore").splitlines()
+    if size > 65536:
+        lines = lines[1:]  # first line is cut off by the seek
+    lines = lines[-200:]
+    return {"exists": True, "tail": lines}
@@ -0,0 +1,113 @@
+import asyncio
+from typing import Dict, Tuple
+from urllib.parse import urljoin
+
+import aiohttp  # type: ignore
+import lxml.html  # type: ignore
+
+from parsing import parse_measuring_points_html
+
+
+LOGIN_URL = "https://www.saveris.net/users/login"
+MEASURING_POINTS_URL = "https://www.saveris.net/MeasuringPts"
+
+# Same fallbacks the browser login used, in priority order
+_EMAIL_XPATHS = (
+    ".//input[@type='email']",
+    ".//input[@name='email']",
+    ".//input[@name='username']",
+    ".//input[@type='text']",
+)
+
+_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+
+def _login_form(html: str, page_url: str, email: str, password: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Build the login POST from the form on the login page: hidden fields
+    (CSRF token etc.) are passed through, email/password filled in.
+    """
+    doc = lxml.html.fromstring(html)
+    forms = doc.xpath("//form[.//input[@type='password']]")
+    if not forms:
+        raise RuntimeError("Could not locate login form")
+    form = forms[0]
+
+    email_name = None
+    for xp in _EMAIL_XPATHS:
+        names = form.xpath(xp + "/@name")
+        if names:
+            email_name = names[0]
+            break
+    pwd_names = form.xpath(".//input[@type='password']/@name")
+
+    if not email_name or not pwd_names:
+        raise RuntimeError("Could not locate email/password inputs")
+
+    payload = {
+        inp.get("name"): inp.get("value") or ""
+        for inp in form.xpath(".//input[@type='hidden'][@name]")
+    }
+    payload[email_name] = email
+    payload[pwd_names[0]] = password
+
+    action = urljoin(page_url, form.get("action") or page_url)
+    return action, payload
+
+
+async def login_async(session: aiohttp.ClientSession, email: str, password: str) -> None:
+    async with session.get(LOGIN_URL) as resp:
+        resp.raise_for_status()
+        action, payload = _login_form(await resp.text(), str(resp.url), email, password)
+
+    async with session.post(action, data=payload) as resp:
+        resp.raise_for_status()
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    One session for the life of the process: keeps the login cookie and
+    lets repeat scans reuse pooled connections.
+    """
+    return aiohttp.ClientSession(
+        cookie_jar=aiohttp.CookieJar(),
+        connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60),
+        timeout=_TIMEOUT,
+    )
+
+
+def _needs_login(resp: aiohttp.ClientResponse) -> bool:
+    return resp.status == 401 or str(resp.url).startswith(LOGIN_URL)
+
+
+async def scrape_once_async(session: aiohttp.ClientSession, email: str, password: str) -> Dict:
+    try:
+        # The session usually still holds a valid cookie; only log in when bounced
+        async with session.get(MEASURING_POINTS_URL) as resp:
+            logged_in = not _needs_login(resp)
+            if logged_in:
+                resp.raise_for_status()
+                html = await resp.text()
+
+        if not logged_in:
+            await login_async(session, email, password)
+            async with session.get(MEASURING_POINTS_URL) as resp:
+                if _needs_login(resp):
+                    raise RuntimeError("Login failed (redirected back to login page)")
+                resp.raise_for_status()
+                html = await resp.text()
+
+        rows = parse_measuring_points_html(html)
+        return {
+            "status": "ok",
+            "count": len(rows),
+            "measuring_points": rows,
+        }
+
+    except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return {
+            "status": "error",
+            "error": str(e) or type(e).__name__,
+            "count": 0,
+            "measuring_points": [],
+        }
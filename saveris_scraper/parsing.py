@@ -0,0 +1,138 @@
+import re
+from typing import Optional, Dict, List
+
+import lxml.etree  # type: ignore
+import lxml.html  # type: ignore
+
+
+_FLOAT_RE = re.compile(r"\s*([+-]?\d+(?:\.\d+)?)")
+
+# Group names are the output keys. The dew point unit contains "°C", so
+# it must come before the plain temperature alternative.
+_UNIT_RE = re.compile(
+    r"(?P<dew_point_c>°c\s*td)"
+    r"|(?P<humidity_pct>%rh)"
+    r"|(?P<absolute_humidity_gm3>g/m[³3])"
+    r"|(?P<temperature_c>°c)",
+    re.IGNORECASE,
+)
+
+_NOT_DETAILS = "[not(contains(concat(' ', normalize-space(@class), ' '), ' row-details '))]"
+
+_WS_RE = re.compile(r"\s+")
+
+# Tags whose content renders on its own line in the browser (innerText)
+_BLOCK_TAGS = {"br", "div", "p", "li", "tr"}
+
+
+# ----------------- helpers -----------------
+
+def _extract_float(s: str) -> Optional[float]:
+    if not s:
+        return None
+    m = _FLOAT_RE.match(s)
+    try:
+        return float(m.group(1)) if m else None
+    except ValueError:
+        return None
+
+
+def parse_measurements_cell(cell_text: str) -> Dict[str, Optional[float]]:
+    lines = [ln.strip() for ln in (cell_text or "").splitlines() if ln.strip()]
+    out = {
+        "temperature_c": None,
+        "humidity_pct": None,
+        "dew_point_c": None,
+        "absolute_humidity_gm3": None,
+    }
+
+    for ln in lines:
+        m = _UNIT_RE.search(ln)
+        if not m:
+            continue
+        v = _extract_float(ln)
+        if v is None:
+            continue
+        out[m.lastgroup] = v
+
+    return out
+
+
+def _cell_text(el) -> str:
+    """
+    Like the browser's innerText: whitespace from the markup collapses to a
+    single space, and lines break only at <br> and block elements, so
+    multi-value cells keep one measurement per line.
+    """
+    parts: List[str] = []
+
+    def walk(node) -> None:
+        if node.text:
+            parts.append(_WS_RE.sub(" ", node.text))
+        for child in node:
+            # Comments and processing instructions have no string tag
+            if isinstance(child.tag, str):
+                block = child.tag.lower() in _BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                walk(child)
+                if block:
+                    parts.append("\n")
+            if child.tail:
+                parts.append(_WS_RE.sub(" ", child.tail))
+
+    walk(el)
+    lines = (ln.strip() for ln in "".join(parts).split("\n"))
+    return "\n".join(ln for ln in lines if ln)
+
+
+# ----------------- html -----------------
+
+def parse_measuring_points_html(html: str) -> List[Dict]:
+    results: List[Dict] = []
+
+    try:
+        doc = lxml.html.fromstring(html)
+    except lxml.etree.ParserError:
+        # Empty or whitespace-only body
+        raise RuntimeError("Measuring points table not found")
+    if not doc.xpath("//table[@id='measuring-points']"):
+        raise RuntimeError("Measuring points table not found")
+
+    # XPath spelling of "tr:not(.row-details)". Browsers always insert
+    # <tbody>, but raw server HTML (the HTTP scraper) may not have one.
+    trs = doc.xpath(
+        f"//table[@id='measuring-points']/tbody/tr{_NOT_DETAILS}"
+        f" | //table[@id='measuring-points']/tr{_NOT_DETAILS}"
+    )
+
+    for tr in trs:
+        tds = tr.xpath("./td")
+        if len(tds) < 7:
+            continue
+
+        measuring_point = _cell_text(tds[2])
+
+        links = tds[3].xpath(".//a")
+        if links:
+            group = _cell_text(links[0])
+        else:
+            group = _cell_text(tds[3]) or None
+
+        parsed = parse_measurements_cell(_cell_text(tds[4]))
+
+        last_meas = _cell_text(tds[5]) or None
+        internal_id = _cell_text(tds[6]) or None
+
+        results.append({
+            "measuring_point": measuring_point,
+            "group": group,
+            "temperature_c": parsed["temperature_c"],
+            "humidity_pct": parsed["humidity_pct"],
+            "dew_point_c": parsed["dew_point_c"],
+            "absolute_humidity_gm3": parsed["absolute_humidity_gm3"],
+            "last_measurement": last_meas,
+            "internal_id": internal_id,
+        })
+
+    return results
@@ -1,3 +1,4 @@
 #!/usr/bin/env sh
 set -e
-python /app.py
\ No newline at end of file
+cd /
+exec uvicorn app:app --host 0.0.0.0 --port 8088
\ No newline at end of file
@@ -0,0 +1,99 @@
+import asyncio
+
+import aiohttp  # type: ignore
+from aiohttp import web  # type: ignore
+from aiohttp.test_utils import TestServer  # type: ignore
+
+import http_client
+from http_client import _login_form, scrape_once_async
+
+
+_LOGIN_PAGE = """
+<form action="/users/login" method="post">
+  <input type="hidden" name="_csrf" value="tok123">
+  <input type="text" name="nickname">
+  <input type="email" name="email">
+  <input type="password" name="password">
+  <button type="submit">Login</button>
+</form>
+"""
+
+_TABLE_PAGE = """
+<table id="measuring-points">
+  <tr><td></td><td></td><td>Fridge</td><td>Kitchen</td>
+      <td>4.5 °C<br>55 %rh</td><td>now</td><td>1</td></tr>
+</table>
+"""
+
+
+def test_login_form_passes_csrf_and_prefers_email_input():
+    action, payload = _login_form(
+        _LOGIN_PAGE, "https://www.saveris.net/users/login", "me@example.com", "secret",
+    )
+    assert action == "https://www.saveris.net/users/login"
+    # type=email wins over the earlier type=text fallback
+    assert payload == {"_csrf": "tok123", "email": "me@example.com", "password": "secret"}
+
+
+def test_login_form_falls_back_to_username_input():
+    html = """
+    <form><input name="username"><input type="password" name="pw"></form>
+    """
+    _, payload = _login_form(html, "https://www.saveris.net/users/login", "me", "secret")
+    assert payload == {"username": "me", "pw": "secret"}
+
+
+def _run_against_fake_saveris(monkeypatch, logged_in: bool):
+    calls = []
+
+    async def login_get(request):
+        calls.append("GET login")
+        return web.Response(text=_LOGIN_PAGE, content_type="text/html")
+
+    async def login_post(request):
+        form = await request.post()
+        calls.append("POST login")
+        assert form["_csrf"] == "tok123"
+        resp = web.HTTPFound("/MeasuringPts")
+        resp.set_cookie("sid", "ok")
+        raise resp
+
+    async def measuring_points(request):
+        calls.append("GET points")
+        if request.cookies.get("sid") != "ok":
+            raise web.HTTPFound("/users/login")
+        return web.Response(text=_TABLE_PAGE, content_type="text/html")
+
+    async def main():
+        app = web.Application()
+        app.add_routes([
+            web.get("/users/login", login_get),
+            web.post("/users/login", login_post),
+            web.get("/MeasuringPts", measuring_points),
+        ])
+        async with TestServer(app) as server:
+            monkeypatch.setattr(http_client, "LOGIN_URL", str(server.make_url("/users/login")))
+            monkeypatch.setattr(http_client, "MEASURING_POINTS_URL", str(server.make_url("/MeasuringPts")))
+            # The test server is on 127.0.0.1; the default jar ignores cookies for IPs
+            jar = aiohttp.CookieJar(unsafe=True)
+            if logged_in:
+                jar.update_cookies({"sid": "ok"}, server.make_url("/"))
+            async with aiohttp.ClientSession(cookie_jar=jar) as session:
+                return await scrape_once_async(session, "me@example.com", "secret")
+
+    return asyncio.run(main()), calls
+
+
+def test_scrape_skips_login_with_valid_session(monkeypatch):
+    result, calls = _run_against_fake_saveris(monkeypatch, logged_in=True)
+    assert result["status"] == "ok"
+    assert result["count"] == 1
+    assert calls == ["GET points"]
+
+
+def test_scrape_logs_in_once_when_redirected(monkeypatch):
+    result, calls = _run_against_fake_saveris(monkeypatch, logged_in=False)
+    assert result["status"] == "ok"
+    assert result["measuring_points"][0]["temperature_c"] == 4.5
+    assert calls.count("POST login") == 1
+    assert calls[-1] == "GET points"
@@ -0,0 +1,134 @@
+import pytest
+import lxml.html  # type: ignore
+
+from parsing import _cell_text, parse_measurements_cell, parse_measuring_points_html
+
+
+def _td(inner: str):
+    return lxml.html.fromstring(f"<table><tr><td>{inner}</td></tr></table>").xpath("//td")[0]
+
+
+def test_cell_text_br_and_div_split_lines():
+    text = _cell_text(_td("21.5 °C<br>45 %rH<div>9 °C Td</div>3.7 g/m³"))
+    assert [ln.strip() for ln in text.splitlines() if ln.strip()] == [
+        "21.5 °C", "45 %rH", "9 °C Td", "3.7 g/m³",
+    ]
+
+
+def test_parse_measurements_from_br_and_div_cell():
+    parsed = parse_measurements_cell(_cell_text(_td("21.5 °C<br>45 %rH<div>9 °C Td</div>")))
+    assert parsed == {
+        "temperature_c": 21.5,
+        "humidity_pct": 45.0,
+        "dew_point_c": 9.0,
+        "absolute_humidity_gm3": None,
+    }
+
+
+_ROW = (
+    "<tr><td></td><td></td><td>Fridge</td><td><a>Kitchen</a></td>"
+    "<td>4.5 °C<br>55 %rh</td><td>2026-01-01</td><td>42</td></tr>"
+    "<tr class='row-details'><td>details</td></tr>"
+)
+
+
+def test_parse_rows_with_and_without_tbody():
+    for body in (f"<tbody>{_ROW}</tbody>", _ROW):
+        rows = parse_measuring_points_html(f"<html><body><table id='measuring-points'>{body}</table></body></html>")
+        assert [(r["measuring_point"], r["group"], r["temperature_c"], r["humidity_pct"]) for r in rows] == [
+            ("Fridge", "Kitchen", 4.5, 55.0),
+        ]
+
+
+def test_cell_text_collapses_indented_markup():
+    td = _td("\n  <span>21.5</span>\n  <span>°C</span><br>\n  <span>45</span>\n  <span>%rH</span>")
+    assert _cell_text(td) == "21.5 °C\n45 %rH"
+    assert parse_measurements_cell(_cell_text(td)) == {
+        "temperature_c": 21.5,
+        "humidity_pct": 45.0,
+        "dew_point_c": None,
+        "absolute_humidity_gm3": None,
+    }
+
+
+def test_parse_rows_from_indented_server_html():
+    html = """
+    <table id="measuring-points">
+      <tr>
+        <td></td>
+        <td></td>
+        <td>
+          Fridge
+          <small>Room 1</small>
+        </td>
+        <td>
+          <a href="#">
+            Kitchen
+          </a>
+        </td>
+        <td>
+          <span>4.5</span>
+          <span>°C</span><br>
+          <span>55</span>
+          <span>%rh</span>
+        </td>
+        <td>
+          2026-01-01 10:00
+        </td>
+        <td> 42 </td>
+      </tr>
+    </table>
+    """
+    (row,) = parse_measuring_points_html(html)
+    assert row["measuring_point"] == "Fridge Room 1"
+    assert row["group"] == "Kitchen"
+    assert (row["temperature_c"], row["humidity_pct"]) == (4.5, 55.0)
+    assert row["last_measurement"] == "2026-01-01 10:00"
+    assert row["internal_id"] == "42"
+
+
+def test_parse_rows_from_browser_table_outer_html():
+    # What the browser scraper gets back: the table's outerHTML on its own,
+    # with the <tbody> the browser inserted and the page's indentation kept
+    outer_html = """<table id="measuring-points" class="table">
+      <tbody>
+        <tr class="odd">
+          <td></td>
+          <td></td>
+          <td>
+            Cold room
+          </td>
+          <td>
+            Storage
+          </td>
+          <td>
+            <div>
+              <span>-18.2</span>
+              <span>°C</span>
+            </div>
+            <div>
+              <span>-21.0</span>
+              <span>°C Td</span>
+            </div>
+          </td>
+          <td>
+          </td>
+          <td>7</td>
+        </tr>
+        <tr class="row-details">
+          <td colspan="7">details</td>
+        </tr>
+      </tbody>
+    </table>"""
+    (row,) = parse_measuring_points_html(outer_html)
+    assert row["measuring_point"] == "Cold room"
+    assert row["group"] == "Storage"
+    assert (row["temperature_c"], row["dew_point_c"]) == (-18.2, -21.0)
+    assert row["last_measurement"] is None
+    assert row["internal_id"] == "7"
+
+
+def test_parse_empty_body_reports_missing_table():
+    for html in ("", "  \n "):
+        with pytest.raises(RuntimeError, match="Measuring points table not found"):
+            parse_measuring_points_html(html)